@@ -1,15 +1,16 @@
 # app.py - Enhanced CryptoBit Live Tracker
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, request
 import threading
 import time
 import datetime
-import json
+import asyncio
+import aiohttp
+import orjson
 import numpy as np
-import requests
-import pandas as pd
 from collections import deque
+from itertools import islice
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sequence
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -23,6 +24,15 @@ MAX_POINTS_1M = 600  # 10 hours of 1m data
 MAX_POINTS_5M = 288  # 24h of 5m
 MAX_POINTS_15M = 200
 MAX_POINTS_1H = 168  # 7 days
+CHART_POINTS = 150  # 1m samples sent to the chart (and all generate_signal needs)
+FG_CACHE_TTL = 1800  # seconds - alternative.me only updates the index daily
+FG_RETRY_AFTER = 300  # seconds before retrying a failed F&G fetch
+GECKO_INTERVAL = 300  # seconds between CoinGecko polls while the stream is live
+MAX_BACKOFF = 300  # seconds - cap for CoinGecko / ticker stream retry back-off
+STREAM_RETRY = 5  # seconds - first ticker stream reconnect delay
+STREAM_STALE_AFTER = 60  # seconds without a ticker before a coin falls back to CoinGecko
+BINANCE_WS_URL = "wss://stream.binance.com:9443/ws/!ticker@arr"
+BINANCE_KLINES_URL = "https://api.binance.com/api/v3/klines"
 COINS = {
     'BTC': 'bitcoin',
     'ETH': 'ethereum',
@@ -35,14 +45,18 @@ COINS = {
 @dataclass
 class CoinData:
     symbol: str
-    prices_1m: deque = None
     times_1m: deque = None
-    volumes_1m: deque = None
 
     def __post_init__(self):
-        self.prices_1m = deque(maxlen=MAX_POINTS_1M)
+        # 1m series as preallocated ring buffers (SoA) sharing one write index
+        self._prices = np.empty(MAX_POINTS_1M, dtype=np.float64)
+        self._vols = np.empty_like(self._prices)
+        self._ema12 = np.empty_like(self._prices)
+        self._ema26 = np.empty_like(self._prices)
+        self._n = 0     # number of valid samples
+        self._head = 0  # next write slot
+        self._volume_source = None  # 'binance' or 'coingecko'
         self.times_1m = deque(maxlen=MAX_POINTS_1M)
-        self.volumes_1m = deque(maxlen=MAX_POINTS_1M)
 
         # Higher timeframes (resampled properly)
         self.prices_5m = deque(maxlen=MAX_POINTS_5M)
@@ -51,97 +65,323 @@ class CoinData:
         self.times_5m = deque(maxlen=MAX_POINTS_5M)
         self.times_15m = deque(maxlen=MAX_POINTS_15M)
         self.times_1h = deque(maxlen=MAX_POINTS_1H)
-
-    def append_1m(self, price: float, volume: float):
-        now = datetime.datetime.now()
-        self.prices_1m.append(price)
+        self._last_5m_minute = None
+        self._last_15m_minute = None
+        self._last_1h_hour = None
+        # 1h RSI only changes on resample; None until 20 bars exist
+        self.rsi_1h = None
+
+        # Running 1m RSI, updated O(1) per sample instead of recomputed
+        self.rsi_1m = 50.0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._rsi_count = 0
+
+    def _tail(self, buf: np.ndarray, k: int) -> np.ndarray:
+        # Last k samples oldest-first; copies only if they straddle the wrap point
+        k = min(k, self._n)
+        h = self._head
+        if h >= k:
+            return buf[h - k:h]
+        return np.concatenate((buf[h - k:], buf[:h]))
+
+    def prices_tail(self, k: int) -> np.ndarray:
+        return self._tail(self._prices, k)
+
+    def volumes_tail(self, k: int) -> np.ndarray:
+        return self._tail(self._vols, k)
+
+    def ema12_tail(self, k: int) -> np.ndarray:
+        return self._tail(self._ema12, k)
+
+    def ema26_tail(self, k: int) -> np.ndarray:
+        return self._tail(self._ema26, k)
+
+    def seed_1m(self, prices: np.ndarray, times: np.ndarray):
+        # Bulk-load history into an empty CoinData, equivalent to appending each price.
+        # Samples must already be on the CHECK_INTERVAL grid append_1m runs at
+        prices = np.ascontiguousarray(prices[-MAX_POINTS_1M:], dtype=np.float64)
+        n = len(prices)
+        if n == 0:
+            return
+        self._prices[:n] = prices
+        # Candle volumes aren't comparable to the live 24h volume samples; NaN keeps
+        # the surge check quiet until 20 live samples have replaced them
+        self._vols[:n] = np.nan
+        self._n = n
+        self._head = n % MAX_POINTS_1M
+        self.times_1m.extend(times[-n:].tolist())
+        # Same recurrences as append_1m; runs once per coin at startup
+        values = prices.tolist()
+        self._ema12[0] = self._ema26[0] = values[0]
+        for i in range(1, n):
+            self._ema12[i] = ema_step(self._ema12[i - 1], values[i], 12)
+            self._ema26[i] = ema_step(self._ema26[i - 1], values[i], 26)
+            self._update_rsi(values[i] - values[i - 1])
+
+    def seed_resampled(self, interval: str, prices: np.ndarray, times: np.ndarray):
+        if len(prices) == 0:
+            return
+        series = getattr(self, f'prices_{interval}')
+        series.extend(prices.tolist())
+        getattr(self, f'times_{interval}').extend(times.tolist())
+        # Mark the last bar's slot as filled so the live resampler doesn't repeat it
+        if interval == '1h':
+            self._last_1h_hour = int(times[-1] // 3600) % 24
+        else:
+            setattr(self, f'_last_{interval}_minute', int(times[-1] // 60) % 60)
+        if interval == '1h' and len(series) >= 20:
+            self.rsi_1h = calculate_rsi(series, 14)
+
+    def _update_rsi(self, delta: float, period: int = 14):
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+        self._rsi_count += 1
+        if self._rsi_count <= period:
+            # Seed with a simple average of the first `period` deltas
+            self._avg_gain += gain / period
+            self._avg_loss += loss / period
+            if self._rsi_count < period:
+                return
+        else:
+            # Wilder's smoothing
+            self._avg_gain = (self._avg_gain * (period - 1) + gain) / period
+            self._avg_loss = (self._avg_loss * (period - 1) + loss) / period
+        if self._avg_loss == 0:
+            # Flat window is neutral, not overbought
+            self.rsi_1m = 100.0 if self._avg_gain > 0 else 50.0
+        else:
+            self.rsi_1m = float(100 - (100 / (1 + self._avg_gain / self._avg_loss)))
+
+    def append_1m(self, price: float, volume: float, volume_source: Optional[str] = None):
+        if volume_source != self._volume_source:
+            # Binance's single-pair volume and CoinGecko's cross-exchange total differ in
+            # scale; NaN-mask the old window so the surge check never compares the two
+            self._vols[:] = np.nan
+            self._volume_source = volume_source
+        # Epoch seconds; minute/hour derived once instead of datetime attribute lookups
+        now = time.time()
+        minute = int(now // 60) % 60
+        hour = int(now // 3600) % 24
+        i = self._head
+        if self._n:
+            self._update_rsi(price - self._prices[i - 1])
+            self._ema12[i] = ema_step(self._ema12[i - 1], price, 12)
+            self._ema26[i] = ema_step(self._ema26[i - 1], price, 26)
+        else:
+            self._ema12[i] = self._ema26[i] = price
+        self._prices[i] = price
+        self._vols[i] = volume
+        self._head = (i + 1) % MAX_POINTS_1M
+        self._n = min(self._n + 1, MAX_POINTS_1M)
         self.times_1m.append(now)
-        self.volumes_1m.append(volume)
 
         # Proper time-based resampling
-        minutes = now.minute
-        if len(self.prices_1m) >= 5 and minutes % 5 == 0 and (
-                len(self.prices_5m) == 0 or self.times_5m[-1].minute != minutes):
+        if self._n >= 5 and minute % 5 == 0 and self._last_5m_minute != minute:
             self.prices_5m.append(price)
             self.times_5m.append(now)
-        if minutes % 15 == 0 and (len(self.prices_15m) == 0 or self.times_15m[-1].minute != minutes):
+            self._last_5m_minute = minute
+        if minute % 15 == 0 and self._last_15m_minute != minute:
             self.prices_15m.append(price)
             self.times_15m.append(now)
-        if now.hour % 1 == 0 and minutes < 5 and (len(self.prices_1h) == 0 or self.times_1h[-1].hour != now.hour):
+            self._last_15m_minute = minute
+        if minute < 5 and self._last_1h_hour != hour:
             self.prices_1h.append(price)
             self.times_1h.append(now)
+            self._last_1h_hour = hour
+            if len(self.prices_1h) >= 20:
+                self.rsi_1h = calculate_rsi(self.prices_1h, 14)
 
 
-# Global state (thread-safe with lock)
+# Global state. data_store is only touched by the updater thread; readers
+# see latest_payload, an immutable (body, etag) tuple swapped in by a single
+# atomic rebind, so /api/data never takes a lock.
 data_store = {coin: CoinData(coin) for coin in COINS}
-latest_response = {}
-data_lock = threading.Lock()
-
-
-def get_prices_safe():
-    ids = ','.join(COINS.values())
+latest_payload = (orjson.dumps({"dashboard": [], "fg": 50, "timestamp": None}), None)
+_fg_cache = {'value': 50, 'ts': float('-inf')}  # -inf: never fetched
+# symbol -> (price, change_24h, quote_volume_24h, monotonic receive time)
+live_tickers = {}
+# symbol -> last (price, change_24h, volume, volume_source) actually received
+last_good_prices = {}
+_fg_lock = threading.Lock()
+
+
+HEADERS = {'User-Agent': 'CryptoBitTracker/1.0'}
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10)
+# aiohttp's default 15s keep-alive equals CHECK_INTERVAL, so pooled TLS
+# connections would often be closed right before the next poll reused them
+HTTP_KEEPALIVE = 4 * CHECK_INTERVAL
+_IDS = ','.join(COINS.values())
+_COIN_SYMBOLS = frozenset(COINS)
+_PRICE_PARAMS = {"vs_currency": "usd", "ids": _IDS, "price_change_percentage": "24h"}
+_BINANCE_SYMBOLS = {f"{sym}USDT": sym for sym in COINS}
+# Candle history fetched at startup so signals don't sit in "Warming Up". The
+# "1m" buffer is rebuilt separately from 1s candles (see get_tick_history_async)
+_WARM_START = (('5m', MAX_POINTS_5M), ('15m', MAX_POINTS_15M), ('1h', MAX_POINTS_1H))
+_KLINES_PAGE = 1000  # Binance's max candles per request
+
+
+async def get_prices_async(session: aiohttp.ClientSession):
     try:
-        headers = {'User-Agent': 'CryptoBitTracker/1.0'}
-        r = requests.get(
-            f"https://api.coingecko.com/api/v3/coins/markets",
-            params={"vs_currency": "usd", "ids": ids, "price_change_percentage": "24h"},
-            headers=headers,
-            timeout=10
-        )
-        if r.status_code == 429:
-            logger.warning("Rate limited by CoinGecko")
-            time.sleep(60)
-            return {}, {}
-        return {item['symbol'].upper(): (item['current_price'], item.get('price_change_percentage_24h', 0),
-                                         item.get('total_volume', 0))
-                for item in r.json() if item['symbol'].upper() in COINS}
+        async with session.get("https://api.coingecko.com/api/v3/coins/markets", params=_PRICE_PARAMS) as r:
+            if r.status == 429:
+                # Back-off is handled by main_loop, don't stall the tick here
+                logger.warning("Rate limited by CoinGecko")
+                return {}
+            items = orjson.loads(await r.read())
+        # CoinGecko sends explicit nulls for missing fields; `or 0` covers those too
+        return {item['symbol'].upper(): (item['current_price'], item.get('price_change_percentage_24h') or 0,
+                                         item.get('total_volume') or 0)
+                for item in items
+                if item['symbol'].upper() in _COIN_SYMBOLS and item.get('current_price') is not None}
     except Exception as e:
         logger.error(f"Price fetch error: {e}")
         return {}
 
 
-def get_fear_greed_safe():
+async def get_klines_async(session: aiohttp.ClientSession, pair: str, interval: str, limit: int,
+                           end_time: Optional[int] = None):
+    params = {"symbol": pair, "interval": interval, "limit": limit}
+    if end_time is not None:
+        params["endTime"] = end_time
     try:
-        r = requests.get("https://api.alternative.me/fng/?limit=1", timeout=8)
-        return int(r.json()["data"][0]["value"])
-    except:
-        return 50
-
-
-# Fixed RSI (Standard Welles Wilder formula)
-def calculate_rsi(prices: List[float], period: int = 14) -> float:
+        async with session.get(BINANCE_KLINES_URL, params=params) as r:
+            if r.status != 200:
+                logger.warning(f"Kline fetch for {pair} {interval} failed: HTTP {r.status}")
+                return None
+            klines = orjson.loads(await r.read())
+        closes = np.array([float(k[4]) for k in klines], dtype=np.float64)
+        times = np.array([k[0] / 1000 for k in klines], dtype=np.float64)
+        return closes, times
+    except Exception as e:
+        logger.error(f"Kline fetch error ({pair} {interval}): {e}")
+        return None
+
+
+async def get_tick_history_async(session: aiohttp.ClientSession, pair: str):
+    # The "1m" buffer actually holds one sample per CHECK_INTERVAL tick. Seeding it
+    # with 60s bars would mix two time scales in the EMAs, RSI, momentum and chart,
+    # so page back through 1s candles and resample them onto the live tick grid
+    pages = []
+    end_time = None
+    start = None
+    while len(pages) * _KLINES_PAGE < MAX_POINTS_1M * CHECK_INTERVAL + _KLINES_PAGE:
+        page = await get_klines_async(session, pair, '1s', _KLINES_PAGE, end_time)
+        if page is None or len(page[0]) == 0:
+            break
+        pages.append(page)
+        if start is None:
+            start = page[1][-1] - (MAX_POINTS_1M - 1) * CHECK_INTERVAL
+        if page[1][0] <= start:
+            break
+        end_time = int(page[1][0] * 1000) - 1
+    if not pages:
+        return None
+    closes = np.concatenate([p[0] for p in reversed(pages)])
+    times = np.concatenate([p[1] for p in reversed(pages)])
+    # Last close at or before each grid point (1s klines skip seconds without trades)
+    grid = times[-1] - CHECK_INTERVAL * np.arange(MAX_POINTS_1M - 1, -1, -1, dtype=np.float64)
+    grid = grid[grid >= times[0]]
+    idx = np.searchsorted(times, grid, side='right') - 1
+    return closes[idx], grid
+
+
+async def warm_start(session: aiohttp.ClientSession):
+    pairs = {sym: pair for pair, sym in _BINANCE_SYMBOLS.items()}
+    jobs = [(sym, interval, limit) for sym in COINS for interval, limit in _WARM_START]
+    results = await asyncio.gather(
+        *(get_tick_history_async(session, pairs[sym]) for sym in COINS),
+        *(get_klines_async(session, pairs[sym], interval, limit) for sym, interval, limit in jobs))
+    for sym, result in zip(COINS, results[:len(COINS)]):
+        if result is not None:
+            data_store[sym].seed_1m(*result)
+    for (sym, interval, _), result in zip(jobs, results[len(COINS):]):
+        if result is not None:
+            data_store[sym].seed_resampled(interval, *result)
+    logger.info(f"Warm start loaded {sum(r is not None for r in results)}/{len(results)} history series")
+
+
+async def stream_tickers(session: aiohttp.ClientSession):
+    # Binance pushes every changed 24h ticker once a second; keep the latest per coin
+    backoff = STREAM_RETRY
+    while True:
+        try:
+            async with session.ws_connect(BINANCE_WS_URL, heartbeat=30) as ws:
+                logger.info("Connected to Binance ticker stream")
+                backoff = STREAM_RETRY
+                async for msg in ws:
+                    if msg.type != aiohttp.WSMsgType.TEXT:
+                        continue
+                    now = time.monotonic()
+                    for t in orjson.loads(msg.data):
+                        sym = _BINANCE_SYMBOLS.get(t['s'])
+                        if sym:
+                            live_tickers[sym] = (float(t['c']), float(t['P']), float(t['q']), now)
+        except Exception as e:
+            logger.error(f"Ticker stream error: {e}")
+        # Doubling back-off so an unreachable / geo-blocked stream isn't hammered
+        logger.warning(f"Reconnecting to ticker stream in {backoff}s")
+        await asyncio.sleep(backoff)
+        backoff = min(MAX_BACKOFF, backoff * 2)
+
+
+def merge_prices(gecko, gecko_fresh):
+    now = time.monotonic()
+    prices = {}
+    for sym in COINS:
+        live = live_tickers.get(sym)
+        if live and now - live[3] < STREAM_STALE_AFTER:
+            price, change_24h, volume, _ = live
+            if sym in gecko:
+                # CoinGecko's aggregated 24h change is kept as the reference figure
+                change_24h = gecko[sym][1]
+            prices[sym] = (price, change_24h, volume, 'binance')
+        elif gecko_fresh and sym in gecko:
+            prices[sym] = gecko[sym] + ('coingecko',)
+    return prices
+
+
+async def get_fg_async(session: aiohttp.ClientSession):
+    with _fg_lock:
+        if time.monotonic() - _fg_cache['ts'] < FG_CACHE_TTL:
+            return _fg_cache['value']
+    try:
+        async with session.get("https://api.alternative.me/fng/?limit=1",
+                               timeout=aiohttp.ClientTimeout(total=8)) as r:
+            value = int(orjson.loads(await r.read())["data"][0]["value"])
+    except Exception:
+        # Keep serving the last known value, and don't re-hit a down service every tick
+        with _fg_lock:
+            _fg_cache['ts'] = time.monotonic() - FG_CACHE_TTL + FG_RETRY_AFTER
+            return _fg_cache['value']
+    with _fg_lock:
+        _fg_cache['value'] = value
+        _fg_cache['ts'] = time.monotonic()
+    return value
+
+
+# Simple (non-smoothed) Wilder RSI over the last `period` deltas
+def calculate_rsi(prices: Sequence[float], period: int = 14) -> float:
     if len(prices) < period + 1:
         return 50.0
-    deltas = np.diff(prices)
-    up = deltas[-period:]
-    down = -deltas[-period:]
-    up = np.append([0], up[up > 0])
-    down = np.append([0], down[down > 0])
+    # Read only the last period+1 values, newest first - works on deques without a list copy
+    window = np.fromiter(islice(reversed(prices), period + 1), dtype=np.float64, count=period + 1)
+    d = -np.diff(window)
+    gain = d[d > 0].sum() / period
+    loss = -d[d < 0].sum() / period
+    if loss == 0:
+        return 100.0 if gain > 0 else 50.0
+    return float(100 - (100 / (1 + gain / loss)))
 
-    if len(up) <= 1 or len(down) <= 1:
-        return 50.0
 
-    avg_gain = np.mean(up[up > 0]) if np.any(up > 0) else 0
-    avg_loss = np.mean(down[down > 0]) if np.any(down > 0) else 0.000001
+def ema_step(prev: float, price: float, span: int) -> float:
+    alpha = 2 / (span + 1)
+    return alpha * price + (1 - alpha) * prev
 
-    if avg_loss == 0:
-        return 100.0
-    rs = avg_gain / avg_loss
-    return float(100 - (100 / (1 + rs)))
 
-
-def ema_series(prices: List[float], span: int):
-    if not prices:
-        return []
-    return pd.Series(prices).ewm(span=span, adjust=False).mean().tolist()
-
-
-def generate_signal(coin_data: CoinData):
-    p1m = list(coin_data.prices_1m)
-    p5m = list(coin_data.prices_5m)
-    p15m = list(coin_data.prices_15m)
-    p1h = list(coin_data.prices_1h)
-    vol = list(coin_data.volumes_1m)
+def generate_signal(coin_data: CoinData, fg: int = 50, p1m: Optional[np.ndarray] = None):
+    if p1m is None:
+        p1m = coin_data.prices_tail(CHART_POINTS)
 
     if len(p1m) < 100:
         return "Warming Up", 0, "text-secondary", []
@@ -150,10 +390,8 @@ def generate_signal(coin_data: CoinData):
     reasons = []
 
     # RSI Multi-timeframe
-    rsi1 = calculate_rsi(p1m, 14)
-    rsi5 = calculate_rsi(p5m, 14) if len(p5m) >= 20 else rsi1
-    rsi15 = calculate_rsi(p15m, 14) if len(p15m) >= 20 else rsi1
-    rsi60 = calculate_rsi(p1h, 14) if len(p1h) >= 20 else rsi1
+    rsi1 = coin_data.rsi_1m
+    rsi60 = coin_data.rsi_1h if coin_data.rsi_1h is not None else rsi1
 
     if rsi1 < 25:
         score += 25; reasons.append("1m Extreme Oversold")
@@ -164,9 +402,7 @@ def generate_signal(coin_data: CoinData):
 
     # EMA Trend
     if len(p1m) >= 50:
-        ema12 = ema_series(p1m, 12)
-        ema26 = ema_series(p1m, 26)
-        if ema12 and ema26 and ema12[-1] > ema26[-1]:
+        if coin_data.ema12_tail(1)[0] > coin_data.ema26_tail(1)[0]:
             score += 20
             reasons.append("EMA Bullish")
         else:
@@ -174,9 +410,10 @@ def generate_signal(coin_data: CoinData):
             reasons.append("EMA Bearish")
 
     # Volume Surge
-    if len(vol) >= 20:
-        recent_vol = np.mean(vol[-10:])
-        prev_vol = np.mean(vol[-20:-10])
+    if len(p1m) >= 20:
+        vol = coin_data.volumes_tail(20)
+        recent_vol = vol[10:].mean()
+        prev_vol = vol[:10].mean()
         if recent_vol > prev_vol * 1.8:
             price_change = (p1m[-1] - p1m[-10]) / p1m[-10]
             if price_change > 0.01:
@@ -186,8 +423,7 @@ def generate_signal(coin_data: CoinData):
                 score -= 20;
                 reasons.append("Distribution Risk")
 
-    # Fear & Greed Boost
-    fg = get_fear_greed_safe()
+    # Fear & Greed Boost (fetched once per tick by the updater)
     if fg < 20:
         score += 30; reasons.append(f"Extreme Fear ({fg})")
     elif fg > 80:
@@ -207,62 +443,104 @@ def generate_signal(coin_data: CoinData):
         return "NEUTRAL", 30, "text-muted", reasons[:2]
 
 
-def background_updater():
-    while True:
-        start_time = time.time()
-        prices_data = get_prices_safe()
-        fg_index = get_fear_greed_safe()
-
-        dashboard = []
-        chart_data = {}
-
-        for symbol, coin_data in data_store.items():
-            if symbol not in prices_data:
-                continue
-            price, change_24h, volume = prices_data[symbol]
-            coin_data.append_1m(price, volume)
-
-            signal, prob, color, reasons = generate_signal(coin_data)
-
-            dashboard.append({
-                "coin": symbol,
-                "price": round(price, 6),
-                "change": round(change_24h, 2),
-                "signal": signal,
-                "prob": prob,
-                "color_class": color,
-                "reasons": " • ".join(reasons) if reasons else "Analyzing..."
-            })
-
-            # Chart data (last 150 points)
-            prices = list(coin_data.prices_1m)[-150:]
-            if len(prices) > 26:
-                ema_fast = ema_series(prices, 12)
-                ema_slow = ema_series(prices, 26)
-            else:
-                ema_fast = ema_slow = []
-
-            chart_data[symbol] = {
-                "labels": list(range(len(prices))),
-                "prices": prices,
-                "ema_fast": ema_fast,
-                "ema_slow": ema_slow
-            }
-
-        response = {
-            "dashboard": dashboard,
-            "chart_data": chart_data,
-            "fg": fg_index,
-            "timestamp": datetime.datetime.now().isoformat()
+async def main_loop():
+    connector = aiohttp.TCPConnector(keepalive_timeout=HTTP_KEEPALIVE, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(headers=HEADERS, timeout=HTTP_TIMEOUT, connector=connector) as session:
+        stream = asyncio.create_task(stream_tickers(session))  # keep a reference so it isn't GC'd
+        try:
+            await warm_start(session)
+        except Exception:
+            logger.exception("Warm start failed")
+        gecko, gecko_ts = {}, float('-inf')
+        backoff, retry_at = CHECK_INTERVAL, float('-inf')
+        while True:
+            start_time = time.time()
+            try:
+                now = time.monotonic()
+                streaming = all(sym in live_tickers and now - live_tickers[sym][3] < STREAM_STALE_AFTER
+                                for sym in COINS)
+                # Poll CoinGecko every tick only while the stream is down, and never
+                # before the back-off window after a failure (429s, timeouts) has passed
+                if now >= retry_at and (not streaming or now - gecko_ts >= GECKO_INTERVAL):
+                    polled, fg_index = await asyncio.gather(get_prices_async(session), get_fg_async(session))
+                    if polled:
+                        gecko, gecko_ts = polled, now
+                        backoff = CHECK_INTERVAL
+                    else:
+                        backoff = min(MAX_BACKOFF, backoff * 2)
+                        retry_at = now + backoff
+                        logger.warning(f"CoinGecko unavailable, retrying in {backoff}s")
+                else:
+                    polled, fg_index = {}, await get_fg_async(session)
+                update_state(merge_prices(gecko, bool(polled)), fg_index)
+            except Exception:
+                # One bad tick must not end asyncio.run and freeze the dashboard
+                logger.exception("Update tick failed")
+
+            elapsed = time.time() - start_time
+            sleep_time = max(0, CHECK_INTERVAL - elapsed)
+            await asyncio.sleep(sleep_time)
+
+
+def update_state(prices_data, fg_index):
+    dashboard = []
+    chart_data = {}
+
+    for symbol, coin_data in data_store.items():
+        if symbol in prices_data:
+            price, change_24h, volume, volume_source = prices_data[symbol]
+            coin_data.append_1m(price, volume, volume_source)
+            last_good_prices[symbol] = prices_data[symbol]
+        elif symbol in last_good_prices:
+            # No fresh quote: keep rendering the last state without adding a stale sample
+            price, change_24h, volume, _ = last_good_prices[symbol]
+        else:
+            continue
+
+        # One tail slice shared by the signal and the chart
+        tail = coin_data.prices_tail(CHART_POINTS)
+        signal, prob, color, reasons = generate_signal(coin_data, fg_index, tail)
+
+        dashboard.append({
+            "coin": symbol,
+            "price": round(price, 6),
+            "change": round(change_24h, 2),
+            "signal": signal,
+            "prob": prob,
+            "color_class": color,
+            "reasons": " • ".join(reasons) if reasons else "Analyzing..."
+        })
+
+        # Chart data (last CHART_POINTS points)
+        prices = tail.tolist()
+        if len(prices) > 26:
+            ema_fast = coin_data.ema12_tail(CHART_POINTS).tolist()
+            ema_slow = coin_data.ema26_tail(CHART_POINTS).tolist()
+        else:
+            ema_fast = ema_slow = []
+
+        chart_data[symbol] = {
+            "labels": list(range(len(prices))),
+            "prices": prices,
+            "ema_fast": ema_fast,
+            "ema_slow": ema_slow
         }
 
-        with data_lock:
-            global latest_response
-            latest_response = response
+    response = {
+        "dashboard": dashboard,
+        "chart_data": chart_data,
+        "fg": fg_index,
+        "timestamp": datetime.datetime.now().isoformat()
+    }
+
+    encoded = orjson.dumps(response)
 
-        elapsed = time.time() - start_time
-        sleep_time = max(0, CHECK_INTERVAL - elapsed)
-        time.sleep(sleep_time)
+    global latest_payload
+    latest_payload = (encoded, response["timestamp"])
+
+
+def background_updater():
+    asyncio.run(main_loop())
 
 
 # Start background thread
@@ -276,8 +554,14 @@ def index():
 
 @app.route('/api/data')
 def api_data():
-    with data_lock:
-        return jsonify(latest_response or {"dashboard": [], "fg": 50, "timestamp": None})
+    body, etag = latest_payload
+    resp = Response(body, mimetype='application/json')
+    if etag:
+        # Force revalidation so repeat polls within a tick get a 304
+        resp.cache_control.no_cache = True
+        resp.set_etag(etag)
+        return resp.make_conditional(request)
+    return resp
 
 
 if __name__ == '__main__':